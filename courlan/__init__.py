@@ -25,4 +25,6 @@ from .urlutils import (
     get_host_and_path,
     get_hostinfo,
     is_external,
+    make_is_external,
+    make_url_fixer,
 )
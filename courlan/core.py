@@ -25,7 +25,13 @@ from .filters import (
 )
 from .network import redirection_test
 from .settings import BLACKLIST
-from .urlutils import extract_domain, fix_relative_urls, is_external, is_known_link
+from .urlutils import (
+    canonicalize_link,
+    extract_domain,
+    is_known_link,
+    make_is_external,
+    make_url_fixer,
+)
 
 
 LOGGER = logging.getLogger(__name__)
@@ -149,6 +155,7 @@ def extract_links(
         Nothing.
     """
     candidates, validlinks = set(), set()  # type: Set[str], Set[str]
+    known_links: Set[str] = set()
     if not pagecontent:
         return validlinks
     # define host reference
@@ -172,10 +179,12 @@ def extract_links(
             if linkmatch:
                 candidates.add(linkmatch[1])
     # filter candidates
+    fix_url = make_url_fixer(base_url)
+    is_external = make_is_external(reference, ignore_suffix=True)
     for link in candidates:
         # repair using base
         if not link.startswith("http"):
-            link = fix_relative_urls(base_url, link)
+            link = fix_url(link)
         # check
         if no_filter is False:
             checked = check_url(
@@ -189,12 +198,11 @@ def extract_links(
                 continue
             link = checked[0]
             # external/internal links
-            if external_bool != is_external(
-                url=link, reference=reference, ignore_suffix=True
-            ):
+            if external_bool != is_external(link):
                 continue
-        if is_known_link(link, validlinks):
+        if is_known_link(link, known_links, canonical=True):
             continue
+        known_links.add(canonicalize_link(link))
         validlinks.add(link)
     # return
     LOGGER.info("%s links found – %s valid links", len(candidates), len(validlinks))
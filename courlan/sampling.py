@@ -6,10 +6,12 @@ Utilities dedicated to URL sampling
 import logging
 
 # from functools import cmp_to_key
+from array import array
 from random import sample
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
-from .urlstore import UrlStore
+from .filters import validate_url
+from .urlutils import get_host_and_path
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,41 +30,83 @@ def sample_urls(
         LOGGER.setLevel(logging.DEBUG)
     else:
         LOGGER.setLevel(logging.ERROR)
-    # store
+    # validate and split URLs
     output_urls = []
-    use_compression = len(input_urls) > 10**6
-    urlstore = UrlStore(
-        compressed=use_compression, language=None, strict=strict, verbose=verbose
-    )
-    urlstore.add_urls(sorted(input_urls))
-    # iterate
-    for domain in urlstore.urldict:  # key=cmp_to_key(locale.strcoll)
-        urlpaths = [
-            p.urlpath
-            for p in urlstore._load_urls(domain)
-            if p.urlpath not in ("/", None)
-        ]
+    # store paths contiguously to save memory: one buffer and offsets per host
+    buckets: Dict[str, Tuple[bytearray, "array[int]"]] = {}
+    # paths without trailing slashes to discard variants of the same path
+    seen_paths: Dict[str, Set[str]] = {}
+    # http/https switch as in the UrlStore: merge both variants of a URL or host
+    # under https and only keep http for hosts which are never seen with https
+    unique_urls: Dict[str, str] = {}
+    for url in input_urls:
+        if url.startswith("http://"):
+            unique_urls.setdefault("https://" + url[7:], url)
+        else:
+            unique_urls[url] = url
+    http_only: Set[str] = set()
+    for url in unique_urls.values():
+        validation_result, parsed_url = validate_url(url)
+        if validation_result is False:
+            LOGGER.debug("invalid URL: %s", url)
+            continue
+        try:
+            host, path = get_host_and_path(parsed_url)
+        except ValueError:
+            LOGGER.debug("discarding URL: %s", url)
+            continue
+        if host.startswith("http://"):
+            host = "https://" + host[7:]
+            if host not in buckets:
+                http_only.add(host)
+        else:
+            http_only.discard(host)
+        if host not in buckets:
+            buckets[host] = (bytearray(), array("q", [0]))
+            seen_paths[host] = set()
+        stripped_path = path.rstrip("/")
+        if path != "/" and stripped_path not in seen_paths[host]:
+            seen_paths[host].add(stripped_path)
+            buffer, offsets = buckets[host]
+            buffer += path.encode("utf-8", "surrogatepass")
+            offsets.append(len(buffer))
+    # iterate over domains in the order of the output
+    domains = {
+        ("http://" + host[8:] if host in http_only else host): host for host in buckets
+    }
+    for domain in sorted(domains):
+        buffer, offsets = buckets[domains[domain]]
+        total = len(offsets) - 1
         # too few or too many URLs
         if (
-            not urlpaths
+            not total
             or exclude_min is not None
-            and len(urlpaths) < exclude_min
+            and total < exclude_min
             or exclude_max is not None
-            and len(urlpaths) > exclude_max
+            and total > exclude_max
         ):
-            LOGGER.warning("discarded (size): %s\t\turls: %s", domain, len(urlpaths))
+            LOGGER.warning("discarded (size): %s\t\turls: %s", domain, total)
             continue
-        # sample
-        if len(urlpaths) > samplesize:
-            mysample = sorted(sample(urlpaths, k=samplesize))
+        # sample indices and only rebuild the selected paths
+        indices: Sequence[int]
+        if total > samplesize:
+            if samplesize > total // 2:
+                excluded = set(sample(range(total), k=total - samplesize))
+                indices = [i for i in range(total) if i not in excluded]
+            else:
+                indices = sample(range(total), k=samplesize)
         else:
-            mysample = urlpaths
+            indices = range(total)
+        mysample = sorted(
+            buffer[offsets[i] : offsets[i + 1]].decode("utf-8", "surrogatepass")
+            for i in indices
+        )
         output_urls.extend([domain + p for p in mysample])
         LOGGER.debug(
             "%s\t\turls: %s\tprop.: %s",
             domain,
             len(mysample),
-            len(mysample) / len(urlpaths),
+            len(mysample) / total,
         )
     # return gathered URLs
     return output_urls
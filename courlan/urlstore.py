@@ -30,7 +30,7 @@ from urllib.robotparser import RobotFileParser
 from .core import filter_links
 from .filters import lang_filter, validate_url
 from .meta import clear_caches
-from .urlutils import get_host_and_path, is_known_link
+from .urlutils import canonicalize_link, get_host_and_path, is_known_link
 
 
 LOGGER = logging.getLogger(__name__)
@@ -159,16 +159,24 @@ class UrlStore:
             if self.urldict[domain].state is State.BUSTED:
                 return
             urls = self._load_urls(domain)
-            known = {u.urlpath for u in urls}
+            known = {canonicalize_link(u.urlpath) for u in urls}
         else:
             urls = deque()
             known = set()
 
         # check if the link or its variants are known
         if to_right is not None:
-            urls.extend(t for t in to_right if not is_known_link(t.urlpath, known))
+            urls.extend(
+                t
+                for t in to_right
+                if not is_known_link(t.urlpath, known, canonical=True)
+            )
         if to_left is not None:
-            urls.extendleft(t for t in to_left if not is_known_link(t.urlpath, known))
+            urls.extendleft(
+                t
+                for t in to_left
+                if not is_known_link(t.urlpath, known, canonical=True)
+            )
 
         with self._lock:
             if self.compressed:
@@ -328,7 +336,7 @@ class UrlStore:
         "Check if the given URL has already been stored."
         hostinfo, urlpath = get_host_and_path(url)
         # returns False if domain or URL is new
-        return urlpath in {u.urlpath for u in self._load_urls(hostinfo)}
+        return any(u.urlpath == urlpath for u in self._load_urls(hostinfo))
 
     # DOWNLOADS
 
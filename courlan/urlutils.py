@@ -5,63 +5,167 @@ Functions related to URL manipulation and extraction of URL parts.
 import re
 
 from functools import lru_cache
-from typing import Any, List, Optional, Set, Tuple, Union
-from urllib.parse import urlparse, urlunsplit, ParseResult
-
-from tld import get_tld
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse, ParseResult
 
 
 DOMAIN_REGEX = re.compile(
-    r"(?:http|ftp)s?://"  # protocols
-    r"(?:[^/?#]{,63}\.)?"  # subdomain, www, etc.
-    r"([^/?#.]{4,63}\.[^/?#]{2,63}|"  # domain and extension
-    r"[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}|"  # IPv4
+    r"(?P<scheme>(?:http|ftp)s?)://"  # protocols
+    r"(?P<userinfo>[^/?#@]*@)?"  # user and password
+    r"(?:[^/?#@]{,63}\.)?"  # subdomain, www, etc.
+    r"(?P<host>[^/?#.:@]{4,63}\.[^/?#:@]{2,63})"  # domain and extension
+    r"(?P<port>:[0-9]*)?"  # port number
+    r"(?:/|$)",  # slash or end of string
+    re.ASCII,
+)
+IP_REGEX = re.compile(
+    r"(?P<scheme>(?:http|ftp)s?)://"  # protocols
+    r"(?P<userinfo>[^/?#@]*@)?"  # user and password
+    r"(?:[^/?#@]{,63}\.)?"  # subdomain, www, etc.
+    r"(?P<host>[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}|"  # IPv4
     r"[0-9a-f:]{16,})"  # IPv6
-    r"(?:/|$)"  # slash or end of string
+    r"(?P<port>:[0-9]*)?"  # port number
+    r"(?:/|$)",  # slash or end of string
+    re.ASCII,
 )
-NO_EXTENSION_REGEX = re.compile(r"(^[^.]+)")
-STRIP_DOMAIN_REGEX = re.compile(r"^.+?:.*?@|(?<=[^0-9]):[0-9]+")
-CLEAN_FLD_REGEX = re.compile(r"^www[0-9]*\.")
 INNER_SLASH_REGEX = re.compile(r"(.+/)+")
 FEED_WHITELIST_REGEX = re.compile(r"(feedburner|feedproxy)", re.I)
+FEED_SEARCH = FEED_WHITELIST_REGEX.search
+# characters leading to further processing by urllib.parse
+UNSAFE_NETLOC_REGEX = re.compile(r"[\[\]\t\n\r\x80-\U0010ffff]")
+# brackets, whitespace and control characters are not valid in domain names
+INVALID_HOST_REGEX = re.compile(r"[\[\]\s\x00-\x1f\x7f]")
+HOST_REGEX = re.compile(
+    r"^(?:[a-z][a-z0-9+.-]*:)?//"  # protocol
+    r"(?:[^/?#]*@)?"  # user info
+    r"([^/?#:]*)"  # host
+    r"([^/?#]*)",  # port
+    re.I,
+)
+
+# trie node key marking the end of a public suffix
+PSL_LEAF = "."
+# public suffix trie, built on first use
+_PSL_TRIE: Optional[Dict[str, Any]] = None
+
+
+def _get_psl_file() -> Path:
+    "Locate the public suffix list shipped with the tld package."
+    import tld
+
+    return Path(tld.__file__).parent / "res" / "effective_tld_names.dat.txt"
+
+
+def _build_psl_trie(filename: Optional[Path] = None) -> Dict[str, Any]:
+    """Read the public suffix list and store its rules in a trie
+    indexed by domain labels in reverse order."""
+    root: Dict[str, Any] = {}
+    with open(filename or _get_psl_file(), "r", encoding="utf-8") as inputfh:
+        for line in inputfh:
+            rule = line.strip()
+            # punycode variants are given in comments
+            if rule.startswith("// xn--"):
+                rule = rule.split()[1]
+            if not rule or rule.startswith("//"):
+                continue
+            node = root
+            labels = rule.split(".")
+            # exception rules are stored as "!label" in the parent node
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[PSL_LEAF] = True
+    return root
+
 
+def _find_suffix_length(labels: List[str]) -> int:
+    """Walk the public suffix trie and return the number of labels
+    of the longest matching suffix (0 if there is no match)."""
+    global _PSL_TRIE
+    if _PSL_TRIE is None:
+        _PSL_TRIE = _build_psl_trie()
+    node = _PSL_TRIE
+    length, suffix_length = 0, 0
+    for label in reversed(labels):
+        # exception: the suffix stops right before this label
+        if "!" + label in node:
+            return length
+        child = node.get(label) or node.get("*")
+        if child is None:
+            break
+        node = child
+        length += 1
+        if PSL_LEAF in node:
+            suffix_length = length
+    return suffix_length
 
-@lru_cache(maxsize=1024)
+
+def _strip_www(fld: str) -> str:
+    "Remove a leading www, www2, etc. label from a domain name."
+    if not fld.startswith("www"):
+        return fld
+    i = 3
+    while i < len(fld) and "0" <= fld[i] <= "9":
+        i += 1
+    if i < len(fld) and fld[i] == ".":
+        return fld[i + 1 :]
+    return fld
+
+
+@lru_cache(maxsize=16384)
 def get_tldinfo(
     url: str, fast: bool = False
 ) -> Union[Tuple[None, None], Tuple[str, str]]:
-    """Cached function to extract top-level domain info"""
+    """Cached function to extract top-level domain info.
+    Arguments are passed positionally internally: keywords slow down
+    the cache lookup and lead to separate entries."""
     if not url or not isinstance(url, str):
         return None, None
     if fast:
-        # try with regexes
+        # try with regexes, IP addresses are rare
         domain_match = DOMAIN_REGEX.match(url)
+        # hosts ending with a digit can also be preceded by a subdomain,
+        # in which case the IP address takes precedence
+        if domain_match is None or domain_match["host"][-1] in "0123456789":
+            ip_match = IP_REGEX.match(url)
+            if ip_match and (
+                domain_match is None
+                or len(ip_match["host"]) < len(domain_match["host"])
+            ):
+                domain_match = ip_match
         if domain_match:
-            full_domain = STRIP_DOMAIN_REGEX.sub("", domain_match[1])
-            clean_match = NO_EXTENSION_REGEX.match(full_domain)
-            if clean_match:
-                return clean_match[0], full_domain
-    # fallback
-    tldinfo = get_tld(url, as_object=True, fail_silently=True)
-    if tldinfo is None:
+            full_domain = domain_match["host"]
+            return full_domain.partition(".")[0], full_domain
+    # fallback: look up the public suffix list
+    host_match = HOST_REGEX.match(url)
+    if not host_match or INVALID_HOST_REGEX.search(host_match[1] + host_match[2]):
+        return None, None
+    labels = host_match[1].lower().rstrip(".").split(".")
+    if "" in labels:
+        return None, None
+    suffix_length = _find_suffix_length(labels)
+    if suffix_length == 0:
         return None, None
+    # registrable domain: label preceding the public suffix
+    if suffix_length == len(labels):
+        domain = fld = ".".join(labels)
+    else:
+        start = len(labels) - suffix_length - 1
+        domain, fld = labels[start], ".".join(labels[start:])
     # this step is necessary to standardize output
-    return tldinfo.domain, CLEAN_FLD_REGEX.sub("", tldinfo.fld)  # type: ignore[union-attr]
+    return domain, _strip_www(fld)
 
 
 def extract_domain(
-    url: str, blacklist: Optional[Set[str]] = None, fast: bool = False
+    url: str, blacklist: Optional[AbstractSet[str]] = None, fast: bool = False
 ) -> Optional[str]:
     """Extract domain name information using top-level domain info"""
-    if blacklist is None:
-        blacklist = set()
-    # new code: Python >= 3.6 with tld module
-    domain, full_domain = get_tldinfo(url, fast=fast)
+    domain, full_domain = get_tldinfo(url, fast)
     # invalid input
     if full_domain is None:
         return None
     # blacklisting
-    if domain in blacklist or full_domain in blacklist:
+    if blacklist and (domain in blacklist or full_domain in blacklist):
         return None
     # return domain
     return full_domain
@@ -78,9 +182,28 @@ def _parse(url: Any) -> ParseResult:
     return parsed_url
 
 
+def _get_base_url_str(url: str) -> Optional[str]:
+    """Find the end of the host part in an HTTP(S) URL without parsing it.
+    Returns None for the cases that urllib.parse treats differently."""
+    start = url.index("://") + 3
+    end = len(url)
+    for char in "/?#":
+        pos = url.find(char, start, end)
+        if pos != -1:
+            end = pos
+    netloc = url[start:end]
+    if UNSAFE_NETLOC_REGEX.search(netloc):
+        return None
+    return url[:end]
+
+
 def get_base_url(url: Any) -> str:
     """Strip URL of some of its parts to get base URL.
     Accepts strings and urllib.parse ParseResult objects."""
+    if isinstance(url, str) and url.startswith(("http://", "https://")):
+        base_url = _get_base_url_str(url)
+        if base_url is not None:
+            return base_url
     parsed_url = _parse(url)
     if parsed_url.scheme:
         scheme = parsed_url.scheme + "://"
@@ -93,10 +216,16 @@ def get_host_and_path(url: Any) -> Tuple[str, str]:
     """Decompose URL in two parts: protocol + host/domain and path.
     Accepts strings and urllib.parse ParseResult objects."""
     parsed_url = _parse(url)
-    hostname = get_base_url(parsed_url)
-    pathval = urlunsplit(
-        ["", "", parsed_url.path, parsed_url.query, parsed_url.fragment]
-    )
+    # same as get_base_url() and urlunsplit() but without further parsing
+    if parsed_url.scheme:
+        hostname = parsed_url.scheme + "://" + parsed_url.netloc
+    else:
+        hostname = parsed_url.netloc
+    pathval = parsed_url.path
+    if parsed_url.query:
+        pathval += "?" + parsed_url.query
+    if parsed_url.fragment:
+        pathval += "#" + parsed_url.fragment
     # correction for root/homepage
     if pathval == "":
         pathval = "/"
@@ -105,6 +234,7 @@ def get_host_and_path(url: Any) -> Tuple[str, str]:
     return hostname, pathval
 
 
+@lru_cache(maxsize=4096)
 def get_hostinfo(url: str) -> Tuple[Optional[str], str]:
     "Convenience function returning domain and host info (protocol + host/domain) from a URL."
     domainname = extract_domain(url, fast=True)
@@ -112,21 +242,33 @@ def get_hostinfo(url: str) -> Tuple[Optional[str], str]:
     return domainname, base_url
 
 
+def make_url_fixer(baseurl: str) -> Callable[[str], str]:
+    """Return a function prepending protocol and host information
+    to relative links, specialized for the given base URL."""
+    scheme = "https:" if baseurl.startswith("https") else "http:"
+
+    def fix_url(url: str) -> str:
+        first = url[:1]
+        if first == "/":
+            if url[1:2] == "/":
+                return scheme + url
+            # imperfect path handling
+            return baseurl + url
+        if first == ".":
+            # don't try to correct these URLs
+            return baseurl + "/" + INNER_SLASH_REGEX.sub("", url)
+        if not url.startswith(("http", "{")):
+            return baseurl + "/" + url
+        # todo: handle here
+        # if url.startswith('{'):
+        return url
+
+    return fix_url
+
+
 def fix_relative_urls(baseurl: str, url: str) -> str:
     "Prepend protocol and host information to relative links."
-    if url.startswith("//"):
-        return "https:" + url if baseurl.startswith("https") else "http:" + url
-    if url.startswith("/"):
-        # imperfect path handling
-        return baseurl + url
-    if url.startswith("."):
-        # don't try to correct these URLs
-        return baseurl + "/" + INNER_SLASH_REGEX.sub("", url)
-    if not url.startswith(("http", "{")):
-        return baseurl + "/" + url
-    # todo: handle here
-    # if url.startswith('{'):
-    return url
+    return make_url_fixer(baseurl)(url)
 
 
 def filter_urls(link_list: List[str], urlfilter: Optional[str]) -> List[str]:
@@ -134,45 +276,70 @@ def filter_urls(link_list: List[str], urlfilter: Optional[str]) -> List[str]:
     if urlfilter is None:
         return sorted(set(link_list))
     # filter links
-    filtered_list = [l for l in link_list if urlfilter in l]
+    filtered_set = {l for l in link_list if urlfilter in l}
     # feedburner option: filter and wildcards for feeds
-    if not filtered_list:
-        filtered_list = [l for l in link_list if FEED_WHITELIST_REGEX.search(l)]
-    return sorted(set(filtered_list))
+    if not filtered_set:
+        filtered_set = set(filter(FEED_SEARCH, link_list))
+    return sorted(filtered_set)
+
+
+def make_is_external(
+    reference: str, ignore_suffix: bool = True
+) -> Callable[[str], bool]:
+    """Return a function determining if a link leads to another host
+    than the given reference URL, which is only parsed once."""
+    stripped_ref, ref = get_tldinfo(reference, True)
+    # comparison
+    if ignore_suffix:
+        target, index = stripped_ref, 0
+    else:
+        target, index = ref, 1
+
+    def check_external(url: str) -> bool:
+        return get_tldinfo(url, True)[index] != target
+
+    return check_external
 
 
 def is_external(url: str, reference: str, ignore_suffix: bool = True) -> bool:
     """Determine if a link leads to another host, takes a reference URL and
     a URL as input, returns a boolean"""
-    stripped_ref, ref = get_tldinfo(reference, fast=True)
-    stripped_domain, domain = get_tldinfo(url, fast=True)
-    # comparison
-    if ignore_suffix:
-        return stripped_domain != stripped_ref
-    return domain != ref
+    return make_is_external(reference, ignore_suffix)(url)
 
 
-def is_known_link(link: str, known_links: Set[str]) -> bool:
-    "Compare the link and its possible variants to the existing URL base."
+def canonicalize_link(link: str) -> str:
+    """Reduce a link to a common form without trailing slashes and with
+    the same protocol for HTTP and HTTPS, to be used with is_known_link()."""
+    link = link.rstrip("/")
+    if link.startswith("https://"):
+        return "http://" + link[8:]
+    return link
+
+
+def is_known_link(link: str, known_links: Set[str], canonical: bool = False) -> bool:
+    """Compare the link and its possible variants to the existing URL base.
+    If canonical is True, the known links are expected to be built with
+    canonicalize_link() and a single lookup is performed."""
+    if canonical:
+        return canonicalize_link(link) in known_links
+
     # check exact link
     if link in known_links:
         return True
 
     # check link and variants with trailing slashes
-    test_links = [link.rstrip("/"), link.rstrip("/") + "/"]
-    if any(test_link in known_links for test_link in test_links):
+    base = link.rstrip("/")
+    if base in known_links or base + "/" in known_links:
         return True
 
     # check link and variants with modified protocol
-    if link.startswith("http"):
-        if link.startswith("https"):
-            testlink = link[:4] + link[5:]
-        else:
-            testlink = "".join([link[:4], "s", link[4:]])
-        if any(
-            test in known_links
-            for test in [testlink, testlink.rstrip("/"), testlink.rstrip("/") + "/"]
-        ):
-            return True
-
-    return False
+    if link.startswith("https"):
+        alt = "http" + link[5:]
+    elif link.startswith("http"):
+        alt = "https" + link[4:]
+    else:
+        return False
+    alt_base = alt.rstrip("/")
+    return (
+        alt in known_links or alt_base in known_links or alt_base + "/" in known_links
+    )